@@ -0,0 +1,185 @@
+import configparser
+import logging
+from collections import deque
+
+logging.basicConfig(level=logging.INFO)
+
+DEFAULT_STATS_CONFIG = {
+    "window": 60,
+    "drawdown_alert": 0.10,
+    "utilisation_spike": 0.20,
+}
+
+def load_stats_config(path: str = 'config.ini') -> dict:
+    """
+    Memuat konfigurasi statistik akun dari bagian [stats] di config.ini.
+
+    Semua kunci bersifat opsional; nilai yang tidak ada memakai DEFAULT_STATS_CONFIG.
+
+    :param path: Lokasi file konfigurasi.
+    :return: Dict konfigurasi statistik.
+    :raises ValueError: Jika ada nilai yang tidak valid.
+    """
+    stats_config = dict(DEFAULT_STATS_CONFIG)
+    config = configparser.ConfigParser()
+    config.read(path)
+    if not config.has_section('stats'):
+        return stats_config
+
+    section = config['stats']
+    try:
+        stats_config["window"] = section.getint('window', fallback=stats_config["window"])
+        stats_config["drawdown_alert"] = section.getfloat('drawdown_alert', fallback=stats_config["drawdown_alert"])
+        stats_config["utilisation_spike"] = section.getfloat('utilisation_spike', fallback=stats_config["utilisation_spike"])
+    except ValueError as e:
+        logging.error(f"Konfigurasi [stats] di config.ini tidak valid: {e}")
+        raise
+
+    if stats_config["window"] < 2:
+        raise ValueError("window di [stats] minimal 2 sampel.")
+    if stats_config["drawdown_alert"] <= 0 or stats_config["utilisation_spike"] <= 0:
+        raise ValueError("drawdown_alert dan utilisation_spike di [stats] harus lebih dari 0.")
+    return stats_config
+
+class RingBuffer:
+    """
+    Buffer berukuran tetap dengan jumlah berjalan, sehingga append dan mean bernilai O(1).
+    """
+
+    def __init__(self, size: int):
+        self._values = deque(maxlen=size)
+        self._total = 0.0
+
+    def append(self, value: float):
+        if len(self._values) == self._values.maxlen:
+            self._total -= self._values[0]
+        self._values.append(value)
+        self._total += value
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def oldest(self) -> float:
+        return self._values[0]
+
+    @property
+    def latest(self) -> float:
+        return self._values[-1]
+
+    @property
+    def mean(self) -> float:
+        return self._total / len(self._values) if self._values else 0.0
+
+class AccountStats:
+    """
+    Statistik bergulir per alamat dari marginSummary setiap siklus.
+
+    Hanya menyimpan `window` sampel terakhir; high-water mark disimpan sebagai
+    satu nilai sehingga tidak perlu riwayat penuh. Semua metrik dihitung dari
+    accountValue mentah, sehingga deposit dan withdrawal ikut terhitung sebagai PnL.
+    """
+
+    def __init__(self, window: int = DEFAULT_STATS_CONFIG["window"],
+                 drawdown_alert: float = DEFAULT_STATS_CONFIG["drawdown_alert"],
+                 utilisation_spike: float = DEFAULT_STATS_CONFIG["utilisation_spike"]):
+        self.drawdown_alert = drawdown_alert
+        self.utilisation_spike = utilisation_spike
+        self.timestamps = RingBuffer(window)
+        self.account_values = RingBuffer(window)
+        self.utilisations = RingBuffer(window)
+        self.leverages = RingBuffer(window)
+        self.high_water_mark = 0.0
+        self._drawdown_alerted = False
+        self._utilisation_alerted = False
+
+    @property
+    def account_value(self) -> float:
+        return self.account_values.latest if self.account_values else 0.0
+
+    @property
+    def drawdown(self) -> float:
+        """
+        :return: Penurunan dari high-water mark dalam rasio (0.1 = 10%).
+        """
+        if self.high_water_mark <= 0:
+            return 0.0
+        return max(0.0, (self.high_water_mark - self.account_value) / self.high_water_mark)
+
+    @property
+    def pnl_velocity(self) -> float:
+        """
+        :return: Perubahan account value per jam selama window.
+        """
+        if len(self.timestamps) < 2:
+            return 0.0
+        elapsed = self.timestamps.latest - self.timestamps.oldest
+        if elapsed <= 0:
+            return 0.0
+        return (self.account_values.latest - self.account_values.oldest) / elapsed * 3600
+
+    @property
+    def margin_utilisation(self) -> float:
+        return self.utilisations.latest if self.utilisations else 0.0
+
+    @property
+    def leverage(self) -> float:
+        return self.leverages.latest if self.leverages else 0.0
+
+    def update(self, account_value: float, total_margin_used: float,
+               total_notional_position: float, timestamp: float) -> list:
+        """
+        Menambahkan satu sampel siklus dan memeriksa kondisi alert.
+
+        :param account_value: Nilai akun (accountValue).
+        :param total_margin_used: Total margin terpakai (totalMarginUsed).
+        :param total_notional_position: Total notional posisi (totalNtlPos).
+        :param timestamp: Waktu sampel dalam detik (epoch).
+        :return: List jenis alert yang baru terpicu ("drawdown", "utilisation").
+        """
+        utilisation = total_margin_used / account_value if account_value > 0 else 0.0
+        leverage = total_notional_position / account_value if account_value > 0 else 0.0
+        # Rata-rata diambil sebelum sampel baru agar lonjakan tidak meredam dirinya sendiri
+        previous_utilisation = self.utilisations.mean if len(self.utilisations) >= 2 else None
+
+        self.timestamps.append(timestamp)
+        self.account_values.append(account_value)
+        self.utilisations.append(utilisation)
+        self.leverages.append(leverage)
+        self.high_water_mark = max(self.high_water_mark, account_value)
+
+        alerts = []
+        drawdown = self.drawdown
+        if drawdown >= self.drawdown_alert:
+            if not self._drawdown_alerted:
+                self._drawdown_alerted = True
+                alerts.append("drawdown")
+        elif drawdown < self.drawdown_alert / 2:
+            self._drawdown_alerted = False
+
+        if previous_utilisation is not None:
+            spike = utilisation - previous_utilisation
+            if spike >= self.utilisation_spike:
+                if not self._utilisation_alerted:
+                    self._utilisation_alerted = True
+                    alerts.append("utilisation")
+            elif spike < self.utilisation_spike / 2:
+                self._utilisation_alerted = False
+
+        return alerts
+
+def format_account_stats(stats: AccountStats) -> str:
+    """
+    Memformat statistik akun untuk pesan Telegram (HTML).
+
+    :param stats: AccountStats milik satu alamat.
+    :return: String multi-baris.
+    """
+    velocity_emoji = "🟢" if stats.pnl_velocity >= 0 else "🔴"
+    return (
+        f"🏦 <b>Equity:</b> {stats.account_value:,.2f} (HWM {stats.high_water_mark:,.2f})\n"
+        f"📉 <b>Drawdown:</b> {stats.drawdown:.2%}\n"
+        f"{velocity_emoji} <b>PnL Velocity:</b> {stats.pnl_velocity:,.2f}/h\n"
+        f"⚖️ <b>Margin Utilisation:</b> {stats.margin_utilisation:.2%} (avg {stats.utilisations.mean:.2%})\n"
+        f"📊 <b>Leverage:</b> {stats.leverage:.2f}X\n"
+    )
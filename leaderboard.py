@@ -0,0 +1,391 @@
+import aiohttp
+import codecs
+import configparser
+import heapq
+import json
+import logging
+from hyperliquid import _safe_float
+from misc import get_header
+from shared import TARGETED_USER_ADDRESSES, DISCOVERED_USER_ADDRESSES, IGNORED_USER_ADDRESSES, user_addresses_lock
+
+logging.basicConfig(level=logging.INFO)
+
+LEADERBOARD_URL = "https://stats-data.hyperliquid.xyz/Mainnet/leaderboard"
+LEADERBOARD_WINDOWS = ("day", "week", "month", "allTime")
+LEADERBOARD_METRICS = ("pnl", "roi", "vlm")
+CHUNK_SIZE = 64 * 1024
+MAX_ROW_SIZE = 1024 * 1024
+
+DEFAULT_DISCOVERY_CONFIG = {
+    "enabled": False,
+    "url": LEADERBOARD_URL,
+    "interval": 3600,
+    "rankings": [("month", "pnl")],
+    "top_n": 10,
+    "buffer": 5,
+    "min_account_value": 0.0,
+}
+
+def _parse_rankings(value: str) -> list:
+    """
+    Mengubah string "window:metric,window:metric" menjadi list tuple.
+
+    :param value: String ranking dari config.ini (contoh: "month:pnl,week:roi").
+    :return: List tuple (window, metric).
+    :raises ValueError: Jika window atau metric tidak dikenal.
+    """
+    rankings = []
+    for item in value.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        window, _, metric = item.partition(':')
+        window, metric = window.strip(), (metric.strip() or "pnl")
+        if window not in LEADERBOARD_WINDOWS or metric not in LEADERBOARD_METRICS:
+            raise ValueError(f"Ranking tidak valid: {item}")
+        rankings.append((window, metric))
+    if not rankings:
+        raise ValueError("Daftar ranking tidak boleh kosong.")
+    return rankings
+
+def load_discovery_config(path: str = 'config.ini') -> dict:
+    """
+    Memuat konfigurasi auto-discovery dari bagian [discovery] di config.ini.
+
+    Semua kunci bersifat opsional; nilai yang tidak ada memakai DEFAULT_DISCOVERY_CONFIG.
+
+    :param path: Lokasi file konfigurasi.
+    :return: Dict konfigurasi discovery.
+    :raises ValueError: Jika ada nilai yang tidak valid.
+    """
+    discovery_config = dict(DEFAULT_DISCOVERY_CONFIG)
+    config = configparser.ConfigParser()
+    config.read(path)
+    if not config.has_section('discovery'):
+        return discovery_config
+
+    section = config['discovery']
+    try:
+        discovery_config["enabled"] = section.getboolean('enabled', fallback=discovery_config["enabled"])
+        discovery_config["url"] = section.get('url', fallback=discovery_config["url"])
+        discovery_config["interval"] = section.getint('interval', fallback=discovery_config["interval"])
+        discovery_config["top_n"] = section.getint('top_n', fallback=discovery_config["top_n"])
+        discovery_config["buffer"] = section.getint('buffer', fallback=discovery_config["buffer"])
+        discovery_config["min_account_value"] = section.getfloat('min_account_value', fallback=discovery_config["min_account_value"])
+        if 'rankings' in section:
+            discovery_config["rankings"] = _parse_rankings(section['rankings'])
+    except ValueError as e:
+        logging.error(f"Konfigurasi [discovery] di config.ini tidak valid: {e}")
+        raise
+
+    if discovery_config["interval"] <= 0 or discovery_config["top_n"] <= 0 or discovery_config["buffer"] < 0:
+        raise ValueError("interval dan top_n harus lebih dari 0, buffer tidak boleh negatif.")
+    return discovery_config
+
+class LeaderboardStreamParser:
+    """
+    Parser JSON inkremental untuk snapshot leaderboard.
+
+    Hanya satu baris leaderboard yang didekode setiap kali, sehingga snapshot
+    berukuran beberapa MB tidak perlu dimuat utuh ke memori. Mendukung format
+    {"leaderboardRows": [...]} maupun array langsung.
+    """
+
+    ROWS_KEY = '"leaderboardRows"'
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ""
+        self._bare_array = None
+        self._in_rows = False
+        self.done = False
+
+    def _find_rows_start(self) -> bool:
+        if self._bare_array is None:
+            stripped = self._buffer.lstrip()
+            if not stripped:
+                return False
+            self._bare_array = stripped.startswith('[')
+        if self._bare_array:
+            self._buffer = self._buffer.lstrip()[1:]
+            return True
+
+        key_index = self._buffer.find(self.ROWS_KEY)
+        if key_index == -1:
+            # Simpan ekor buffer agar kunci yang terpotong antar chunk tetap terdeteksi
+            self._buffer = self._buffer[-len(self.ROWS_KEY):]
+            return False
+
+        array_index = self._buffer.find('[', key_index + len(self.ROWS_KEY))
+        if array_index == -1:
+            self._buffer = self._buffer[key_index:]
+            return False
+
+        self._buffer = self._buffer[array_index + 1:]
+        return True
+
+    def feed(self, chunk: bytes) -> list:
+        """
+        Menambahkan potongan data dan mengembalikan baris yang sudah lengkap.
+
+        :param chunk: Potongan bytes dari response.
+        :return: List dict baris leaderboard yang berhasil didekode.
+        """
+        if self.done:
+            return []
+
+        self._buffer += self._text_decoder.decode(chunk)
+        if not self._in_rows:
+            self._in_rows = self._find_rows_start()
+            if not self._in_rows:
+                return []
+
+        rows = []
+        position = 0
+        length = len(self._buffer)
+        while position < length:
+            char = self._buffer[position]
+            if char in ' \t\r\n,':
+                position += 1
+                continue
+            if char == ']':
+                self.done = True
+                position = length
+                break
+            try:
+                row, position = self._decoder.raw_decode(self._buffer, position)
+            except json.JSONDecodeError:
+                # Baris belum lengkap, tunggu chunk berikutnya
+                if length - position > MAX_ROW_SIZE:
+                    raise ValueError("Baris leaderboard terlalu besar atau tidak valid.")
+                break
+            rows.append(row)
+
+        self._buffer = self._buffer[position:]
+        return rows
+
+    def close(self):
+        """
+        Memastikan seluruh array leaderboard telah selesai dibaca.
+
+        :raises ValueError: Jika stream berakhir sebelum array ditutup.
+        """
+        if not self.done:
+            raise ValueError("Snapshot leaderboard terpotong atau tidak valid.")
+
+def get_row_metric(row: dict, window: str, metric: str) -> float | None:
+    """
+    Mengambil nilai metrik untuk window tertentu dari satu baris leaderboard.
+
+    :param row: Dict baris leaderboard.
+    :param window: Window performa (day, week, month, allTime).
+    :param metric: Metrik performa (pnl, roi, vlm).
+    :return: Nilai metrik atau None jika tidak tersedia.
+    """
+    performances = row.get("windowPerformances")
+    if not isinstance(performances, list):
+        return None
+    for performance in performances:
+        if (isinstance(performance, list) and len(performance) == 2
+                and performance[0] == window and isinstance(performance[1], dict)):
+            value = performance[1].get(metric)
+            return _safe_float(value) if value is not None else None
+    return None
+
+class LeaderboardRanker:
+    """
+    Menyimpan peringkat teratas untuk setiap pasangan (window, metric) saat stream dibaca.
+
+    Setiap ranking memakai min-heap berukuran top_n + buffer, sehingga memori
+    tetap O(top_n + buffer) berapa pun jumlah baris leaderboard.
+    """
+
+    def __init__(self, rankings: list, top_n: int, buffer: int = 0, min_account_value: float = 0.0):
+        self.rankings = list(rankings)
+        self.top_n = top_n
+        self.keep_n = top_n + buffer
+        self.min_account_value = min_account_value
+        self._heaps = {ranking: [] for ranking in self.rankings}
+        self.rows_seen = 0
+
+    def add(self, row: dict):
+        """
+        Memasukkan satu baris leaderboard ke setiap ranking.
+
+        :param row: Dict baris leaderboard.
+        """
+        self.rows_seen += 1
+        if not isinstance(row, dict):
+            return
+        address = row.get("ethAddress")
+        if not (isinstance(address, str) and address.startswith("0x") and len(address) == 42):
+            return
+        address = address.lower()
+        if _safe_float(row.get("accountValue")) < self.min_account_value:
+            return
+
+        for window, metric in self.rankings:
+            score = get_row_metric(row, window, metric)
+            if score is None:
+                continue
+            heap = self._heaps[(window, metric)]
+            entry = (score, address)
+            if len(heap) < self.keep_n:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+    def ranked(self, window: str, metric: str) -> list:
+        """
+        :return: List tuple (address, score) terurut dari skor tertinggi.
+        """
+        heap = self._heaps[(window, metric)]
+        return [(address, score) for score, address in sorted(heap, reverse=True)]
+
+    def enter_set(self) -> set:
+        """
+        :return: Alamat yang masuk top_n pada setidaknya satu ranking.
+        """
+        addresses = set()
+        for window, metric in self.rankings:
+            addresses.update(address for address, _ in self.ranked(window, metric)[:self.top_n])
+        return addresses
+
+    def keep_set(self) -> set:
+        """
+        :return: Alamat yang masih berada dalam top_n + buffer pada setidaknya satu ranking.
+        """
+        addresses = set()
+        for window, metric in self.rankings:
+            addresses.update(address for address, _ in self.ranked(window, metric))
+        return addresses
+
+def reconcile_addresses(tracked: list, discovered: set, enter: set, keep: set, ignored: set = frozenset()) -> tuple:
+    """
+    Menyelaraskan daftar alamat yang dipantau dengan hasil ranking (dengan histeresis).
+
+    Alamat baru hanya ditambahkan jika masuk top_n, dan alamat hasil discovery
+    hanya dihapus jika keluar dari top_n + buffer. Alamat yang ditambahkan
+    manual tidak pernah dihapus, dan alamat yang dihapus manual (ignored) tidak
+    ditambahkan lagi. Urutan alamat yang tersisa dipertahankan dan alamat baru
+    ditambahkan di akhir. Alamat dibandingkan dalam huruf kecil.
+
+    :param tracked: Daftar alamat yang sedang dipantau.
+    :param discovered: Alamat yang sebelumnya ditambahkan oleh discovery.
+    :param enter: Alamat dalam top_n.
+    :param keep: Alamat dalam top_n + buffer.
+    :param ignored: Alamat yang dihapus manual melalui /remove.
+    :return: Tuple (tracked_baru, discovered_baru, added, removed).
+    """
+    tracked_set = {address.lower() for address in tracked}
+    keep = {address.lower() for address in keep}
+    ignored = {address.lower() for address in ignored}
+    # Alamat discovery yang sudah dihapus manual tidak lagi dianggap milik discovery
+    discovered = {address.lower() for address in discovered} & tracked_set
+
+    removed = sorted(address for address in discovered if address not in keep)
+    added = sorted({address.lower() for address in enter} - tracked_set - ignored)
+
+    removed_set = set(removed)
+    new_tracked = [address for address in tracked if address.lower() not in removed_set] + added
+    new_discovered = (discovered - removed_set) | set(added)
+    return new_tracked, new_discovered, added, removed
+
+async def fetch_leaderboard_ranking(session: aiohttp.ClientSession, discovery_config: dict) -> LeaderboardRanker | str:
+    """
+    Mengunduh snapshot leaderboard secara streaming dan menyusun ranking.
+
+    :param session: aiohttp ClientSession untuk request.
+    :param discovery_config: Konfigurasi dari load_discovery_config().
+    :return: LeaderboardRanker atau pesan kesalahan jika gagal.
+    """
+    url = discovery_config["url"]
+    parser = LeaderboardStreamParser()
+    ranker = LeaderboardRanker(
+        discovery_config["rankings"],
+        discovery_config["top_n"],
+        discovery_config["buffer"],
+        discovery_config["min_account_value"]
+    )
+
+    try:
+        logging.info(f"Fetching leaderboard snapshot from {url}")
+        async with session.get(url, headers=get_header()) as response:
+            response.raise_for_status()
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                for row in parser.feed(chunk):
+                    ranker.add(row)
+                if parser.done:
+                    break
+        parser.close()
+        logging.info(f"Processed {ranker.rows_seen} leaderboard rows")
+        return ranker
+    except aiohttp.ClientError as e:
+        logging.error(f"Error fetching leaderboard snapshot: {e}")
+        return f"Error occurred while fetching leaderboard snapshot: {e}"
+    except ValueError as e:
+        logging.error(f"Error parsing leaderboard snapshot: {e}")
+        return f"Error occurred while parsing leaderboard snapshot: {e}"
+
+def load_discovered_addresses() -> set:
+    """
+    Memuat alamat hasil discovery dari file JSON (synchronous).
+
+    :return: Set alamat.
+    """
+    try:
+        with open('discovered_addresses.json', 'r') as f:
+            return {address.lower() for address in json.load(f)}
+    except (FileNotFoundError, json.JSONDecodeError):
+        return set()
+
+def load_ignored_addresses() -> set:
+    """
+    Memuat alamat yang dihapus manual dari file JSON (synchronous).
+
+    :return: Set alamat.
+    """
+    try:
+        with open('ignored_addresses.json', 'r') as f:
+            return {address.lower() for address in json.load(f)}
+    except (FileNotFoundError, json.JSONDecodeError):
+        return set()
+
+def apply_discovery(ranker: LeaderboardRanker) -> tuple:
+    """
+    Menerapkan hasil ranking ke user_addresses.json, discovered_addresses.json, dan memori.
+
+    :param ranker: Hasil fetch_leaderboard_ranking().
+    :return: Tuple (added, removed), atau ([], []) jika gagal menulis file.
+    """
+    with user_addresses_lock:
+        tracked, discovered, added, removed = reconcile_addresses(
+            TARGETED_USER_ADDRESSES.copy(),
+            set(DISCOVERED_USER_ADDRESSES),
+            ranker.enter_set(),
+            ranker.keep_set(),
+            set(IGNORED_USER_ADDRESSES)
+        )
+
+        if not added and not removed and discovered == DISCOVERED_USER_ADDRESSES:
+            return [], []
+
+        try:
+            # discovered_addresses.json ditulis lebih dulu agar alamat baru tidak tercatat sebagai alamat manual
+            with open('discovered_addresses.json', 'w') as f:
+                json.dump(sorted(discovered), f, indent=2)
+            if added or removed:
+                with open('user_addresses.json', 'w') as f:
+                    json.dump(tracked, f, indent=2)
+        except IOError as e:
+            logging.error(f"Gagal memperbarui hasil discovery: {e}")
+            return [], []
+
+        # Urutan alamat yang tersisa tetap sama; alamat baru hanya ditambahkan di akhir
+        TARGETED_USER_ADDRESSES[:] = tracked
+        DISCOVERED_USER_ADDRESSES.clear()
+        DISCOVERED_USER_ADDRESSES.update(discovered)
+
+    logging.info(f"Discovery selesai: {len(added)} ditambahkan, {len(removed)} dihapus")
+    return added, removed
@@ -7,7 +7,9 @@ import aiohttp
 from misc import get_header, get_json
 from message import telegram_send_message, telegram_polling, load_user_addresses, telegram_chat_id
 from hyperliquid import get_position, get_leaderboard_base_info, get_markprice
-from shared import TARGETED_USER_ADDRESSES, user_addresses_lock
+from leaderboard import load_discovery_config, load_discovered_addresses, load_ignored_addresses, fetch_leaderboard_ranking, apply_discovery
+from account_stats import AccountStats, load_stats_config, format_account_stats
+from shared import TARGETED_USER_ADDRESSES, DISCOVERED_USER_ADDRESSES, IGNORED_USER_ADDRESSES, ACCOUNT_STATS, user_addresses_lock
 
 # Konfigurasi logging
 logging.basicConfig(
@@ -21,6 +23,8 @@ logging.basicConfig(
 
 # Inisialisasi TARGETED_USER_ADDRESSES saat startup
 TARGETED_USER_ADDRESSES.extend(load_user_addresses())
+DISCOVERED_USER_ADDRESSES.update(load_discovered_addresses())
+IGNORED_USER_ADDRESSES.update(load_ignored_addresses())
 
 ACCOUNT_INFO_URL_TEMPLATE = 'https://hyperdash.info/trader/{}'
 
@@ -53,6 +57,12 @@ def modify_data(data) -> pd.DataFrame:
     return df[['estimatedPosition', 'leverage', 'estimatedEntrySize', 
               'entry_price', 'position_value', 'unrealized_pnl', 'updateTime']]
 
+def account_stats_text(user_address) -> str:
+    stats = ACCOUNT_STATS.get(user_address)
+    if stats is None:
+        return ""
+    return f"------------------------------\n{format_account_stats(stats)}"
+
 previous_symbols = {}
 previous_position_results = {}
 is_first_runs = {}
@@ -75,7 +85,8 @@ async def send_new_position_message(session: aiohttp.ClientSession, symbol, row,
         f"------------------------------\n"
         f"🎯 <b>Entry Price:</b> {entry_price}\n"
         f"💰 <b>Size:</b> {estimated_entry_size}\n"
-        f"{pnl_emoji} <b>PnL:</b> {pnl}\n\n"
+        f"{pnl_emoji} <b>PnL:</b> {pnl}\n"
+        f"{account_stats_text(user_address)}\n"
         f"Last Update:\n"
         f"{updatetime} (UTC+7)\n"
         f"VIEW PROFILE ON HYPERDASH ({profile_url})"
@@ -93,7 +104,8 @@ async def send_closed_position_message(session: aiohttp.ClientSession, symbol, r
         f"⚠️ [<b>{short_address}</b>]\n"
         f"⛔️ <b>Position closed</b>\n\n"
         f"<b>Position:</b> {symbol} {estimated_position} {leverage}X\n"
-        f"💵 <b>Current Price:</b> {current_price} USDT\n\n"
+        f"💵 <b>Current Price:</b> {current_price} USDT\n"
+        f"{account_stats_text(user_address)}\n"
         f"Last Update:\n"
         f"{updatetime} (UTC+7)\n"
         f"VIEW PROFILE ON HYPERDASH ({profile_url})"
@@ -103,7 +115,10 @@ async def send_closed_position_message(session: aiohttp.ClientSession, symbol, r
 async def send_current_positions(session: aiohttp.ClientSession, position_result, user_address):
     short_address = shorten_address(user_address)
     if position_result.empty:
-        await telegram_send_message(session, f"⚠️ [<b>{short_address}</b>]\n💎 <b>No positions found</b>")
+        message = f"⚠️ [<b>{short_address}</b>]\n💎 <b>No positions found</b>\n"
+        if user_address in ACCOUNT_STATS:
+            message += f"------------------------------\n{format_account_stats(ACCOUNT_STATS[user_address])}"
+        await telegram_send_message(session, message)
     else:
         message = f"⚠️ [<b>{short_address}</b>]\n💎 <b>Current positions:</b>\n\n"
         for symbol, row in position_result.iterrows():
@@ -115,11 +130,32 @@ async def send_current_positions(session: aiohttp.ClientSession, position_result
                 f"{pnl_emoji} <b>PnL:</b> {row['unrealized_pnl']}\n"
                 f"------------------------------\n"
             )
+        if user_address in ACCOUNT_STATS:
+            message += f"{format_account_stats(ACCOUNT_STATS[user_address])}------------------------------\n"
         message += f"<b>Last Update:</b>\n{row['updateTime']} (UTC+7)\n"
         message += f"<a href='{ACCOUNT_INFO_URL_TEMPLATE.format(user_address)}'><b>VIEW PROFILE ON HYPERDASH</b></a>"
         await telegram_send_message(session, message)
 
-async def monitor_positions():
+async def send_account_alert_message(session: aiohttp.ClientSession, alert, user_address):
+    short_address = shorten_address(user_address)
+    stats = ACCOUNT_STATS[user_address]
+    profile_url = ACCOUNT_INFO_URL_TEMPLATE.format(user_address)
+    if alert == "drawdown":
+        title = f"📉 <b>Drawdown alert:</b> {stats.drawdown:.2%} from high-water mark"
+    else:
+        title = f"⚖️ <b>Margin utilisation spike:</b> {stats.margin_utilisation:.2%}"
+    message = (
+        f"⚠️ [<b>{short_address}</b>]\n"
+        f"{title}\n\n"
+        f"{format_account_stats(stats)}"
+        f"ℹ️ Deposits and withdrawals are counted as PnL.\n\n"
+        f"Last Update:\n"
+        f"{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')} (UTC+7)\n"
+        f"VIEW PROFILE ON HYPERDASH ({profile_url})"
+    )
+    await telegram_send_message(session, message)
+
+async def monitor_positions(stats_config):
     async with aiohttp.ClientSession() as session:
         while True:
             try:
@@ -131,6 +167,15 @@ async def monitor_positions():
                 for address in current_addresses:
                     if address not in is_first_runs:
                         is_first_runs[address] = True
+                    if address not in ACCOUNT_STATS:
+                        ACCOUNT_STATS[address] = AccountStats(**stats_config)
+
+                # Alamat yang dihapus (manual atau oleh discovery) harus mulai dari awal jika ditambahkan lagi
+                for address in set(is_first_runs) - set(current_addresses):
+                    is_first_runs.pop(address, None)
+                    previous_symbols.pop(address, None)
+                    previous_position_results.pop(address, None)
+                    ACCOUNT_STATS.pop(address, None)
 
                 tasks = []
                 for user_address in current_addresses:
@@ -141,6 +186,16 @@ async def monitor_positions():
                         await telegram_send_message(session, f"Error untuk alamat {user_address}: {leaderboard_info}", telegram_chat_id)
                         continue
 
+                    alerts = ACCOUNT_STATS[user_address].update(
+                        leaderboard_info['account_value'],
+                        leaderboard_info['total_margin_used'],
+                        leaderboard_info['total_notional_position'],
+                        time.time()
+                    )
+                    if not is_first_runs[user_address]:
+                        for alert in alerts:
+                            tasks.append(send_account_alert_message(session, alert, user_address))
+
                     position_result = modify_data(leaderboard_info)
 
                     new_symbols = position_result.index.difference(previous_symbols.get(user_address, pd.Index([])))
@@ -176,11 +231,48 @@ async def monitor_positions():
                 await telegram_send_message(session, error_message, telegram_chat_id)
                 await asyncio.sleep(60)
 
+async def send_discovery_message(session: aiohttp.ClientSession, added, removed, discovery_config):
+    rankings = ', '.join(f"{window}:{metric}" for window, metric in discovery_config['rankings'])
+    message = (
+        f"🔎 <b>Leaderboard discovery</b>\n"
+        f"<b>Ranking:</b> {rankings} (top {discovery_config['top_n']})\n\n"
+    )
+    for address in added:
+        message += f"❇️ <b>Added:</b> <a href='{ACCOUNT_INFO_URL_TEMPLATE.format(address)}'>{shorten_address(address)}</a>\n"
+    for address in removed:
+        message += f"⛔️ <b>Removed:</b> <a href='{ACCOUNT_INFO_URL_TEMPLATE.format(address)}'>{shorten_address(address)}</a>\n"
+    await telegram_send_message(session, message)
+
+async def monitor_leaderboard(discovery_config):
+    async with aiohttp.ClientSession() as session:
+        while True:
+            try:
+                ranker = await fetch_leaderboard_ranking(session, discovery_config)
+
+                if isinstance(ranker, str):
+                    logging.error(f"Error leaderboard discovery: {ranker}")
+                    await telegram_send_message(session, f"Error leaderboard discovery: {ranker}", telegram_chat_id)
+                else:
+                    added, removed = apply_discovery(ranker)
+                    if added or removed:
+                        await send_discovery_message(session, added, removed, discovery_config)
+
+                await asyncio.sleep(discovery_config['interval'])
+
+            except Exception as e:
+                logging.error(f"Leaderboard discovery error occurred: {e}")
+                await asyncio.sleep(discovery_config['interval'])
+
 async def main():
-    await asyncio.gather(
+    discovery_config = load_discovery_config()
+    stats_config = load_stats_config()
+    tasks = [
         telegram_polling(),
-        monitor_positions()
-    )
+        monitor_positions(stats_config)
+    ]
+    if discovery_config['enabled']:
+        tasks.append(monitor_leaderboard(discovery_config))
+    await asyncio.gather(*tasks)
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -3,7 +3,8 @@ import asyncio
 import configparser
 import logging
 import json
-from shared import TARGETED_USER_ADDRESSES, user_addresses_lock
+from account_stats import format_account_stats
+from shared import TARGETED_USER_ADDRESSES, DISCOVERED_USER_ADDRESSES, IGNORED_USER_ADDRESSES, ACCOUNT_STATS, user_addresses_lock
 
 # Konfigurasi logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -65,61 +66,97 @@ def load_user_addresses() -> list:
     """
     Memuat daftar user_addresses dari file JSON (synchronous).
     
-    :return: List alamat pengguna.
+    :return: List alamat pengguna dalam huruf kecil, tanpa duplikat.
     """
     try:
         with open('user_addresses.json', 'r') as f:
-            return json.load(f)
+            return list(dict.fromkeys(address.lower() for address in json.load(f)))
     except (FileNotFoundError, json.JSONDecodeError):
         return []
 
 async def update_user_addresses(user_address: str) -> bool:
     """
     Menambahkan user_address ke user_addresses.json dan memori.
+
+    Jika alamat sudah dipantau karena ditambahkan oleh leaderboard discovery,
+    alamat tersebut dijadikan alamat manual sehingga tidak dihapus oleh discovery.
     
     :param user_address: Alamat pengguna untuk ditambahkan.
-    :return: True jika berhasil, False jika gagal atau sudah ada.
+    :return: True jika berhasil, False jika gagal atau sudah ada sebagai alamat manual.
     """
     with user_addresses_lock:
         user_addresses = TARGETED_USER_ADDRESSES.copy()
 
-        if user_address in user_addresses:
-            return False
-
         if not (isinstance(user_address, str) and user_address.startswith("0x") and len(user_address) == 42):
             logging.warning(f"Alamat tidak valid: {user_address}")
             return False
 
+        user_address = user_address.lower()
+        if user_address in user_addresses:
+            if user_address not in DISCOVERED_USER_ADDRESSES:
+                return False
+            try:
+                with open('discovered_addresses.json', 'w') as f:
+                    json.dump(sorted(DISCOVERED_USER_ADDRESSES - {user_address}), f, indent=2)
+                DISCOVERED_USER_ADDRESSES.discard(user_address)
+                logging.info(f"Berhasil menjadikan {user_address} sebagai alamat manual")
+                return True
+            except IOError as e:
+                logging.error(f"Gagal memperbarui discovered_addresses.json: {e}")
+                return False
+
         user_addresses.append(user_address)
+        ignored_addresses = IGNORED_USER_ADDRESSES - {user_address}
         try:
+            if ignored_addresses != IGNORED_USER_ADDRESSES:
+                with open('ignored_addresses.json', 'w') as f:
+                    json.dump(sorted(ignored_addresses), f, indent=2)
             with open('user_addresses.json', 'w') as f:
                 json.dump(user_addresses, f, indent=2)
             TARGETED_USER_ADDRESSES[:] = user_addresses
+            IGNORED_USER_ADDRESSES.discard(user_address)
             logging.info(f"Berhasil menambahkan {user_address} ke user_addresses.json")
             return True
         except IOError as e:
             logging.error(f"Gagal memperbarui user_addresses.json: {e}")
             return False
 
-async def remove_user_address(index: int) -> bool:
+async def remove_user_address(target: int | str) -> bool:
     """
-    Menghapus user_address berdasarkan nomor urutan dari file dan memori.
+    Menghapus user_address berdasarkan nomor urutan atau alamat dari file dan memori.
+
+    Alamat yang dihapus dicatat di ignored_addresses.json agar tidak ditambahkan
+    lagi oleh leaderboard discovery sampai ditambahkan ulang dengan /add.
     
-    :param index: Nomor urutan alamat (0-based).
-    :return: True jika berhasil, False jika gagal atau indeks tidak valid.
+    :param target: Nomor urutan alamat (0-based) atau alamat lengkap.
+    :return: True jika berhasil, False jika gagal atau target tidak valid.
     """
     with user_addresses_lock:
         user_addresses = TARGETED_USER_ADDRESSES.copy()
 
+        if isinstance(target, str):
+            target = target.lower()
+            if target not in user_addresses:
+                logging.warning(f"Alamat tidak ditemukan: {target}")
+                return False
+            index = user_addresses.index(target)
+        else:
+            index = target
+
         if not isinstance(index, int) or index < 0 or index >= len(user_addresses):
             logging.warning(f"Indeks tidak valid: {index}")
             return False
 
         removed_address = user_addresses.pop(index)
+        ignored_addresses = IGNORED_USER_ADDRESSES | {removed_address}
         try:
+            with open('ignored_addresses.json', 'w') as f:
+                json.dump(sorted(ignored_addresses), f, indent=2)
             with open('user_addresses.json', 'w') as f:
                 json.dump(user_addresses, f, indent=2)
             TARGETED_USER_ADDRESSES[:] = user_addresses
+            IGNORED_USER_ADDRESSES.add(removed_address)
+            DISCOVERED_USER_ADDRESSES.discard(removed_address)
             logging.info(f"Berhasil menghapus {removed_address} dari user_addresses.json")
             return True
         except IOError as e:
@@ -169,24 +206,42 @@ async def process_telegram_updates(session: aiohttp.ClientSession, offset: int =
                 elif text == '/list':
                     with user_addresses_lock:
                         user_addresses = TARGETED_USER_ADDRESSES.copy()
+                        discovered_addresses = set(DISCOVERED_USER_ADDRESSES)
                     if not user_addresses:
                         await telegram_send_message(session, "Daftar user_address kosong.", str(chat_id))
                     else:
                         message = "Daftar user_address:\n"
                         for i, addr in enumerate(user_addresses):
-                            message += f"{i}. {addr}\n"
+                            auto_mark = " (auto)" if addr in discovered_addresses else ""
+                            message += f"{i}. {addr}{auto_mark}\n"
+                        await telegram_send_message(session, message, str(chat_id))
+
+                elif text == '/stats':
+                    with user_addresses_lock:
+                        user_addresses = TARGETED_USER_ADDRESSES.copy()
+                    if not user_addresses:
+                        await telegram_send_message(session, "Daftar user_address kosong.", str(chat_id))
+                    else:
+                        message = "Statistik akun:\n\n"
+                        for i, addr in enumerate(user_addresses):
+                            stats = ACCOUNT_STATS.get(addr)
+                            message += f"{i}. <b>{addr}</b>\n"
+                            if stats is None or not stats.account_values:
+                                message += "Belum ada data.\n\n"
+                            else:
+                                message += f"{format_account_stats(stats)}\n"
                         await telegram_send_message(session, message, str(chat_id))
 
                 elif text.startswith('/remove'):
                     parts = text.split(maxsplit=1)
-                    if len(parts) < 2 or not parts[1].isdigit():
-                        await telegram_send_message(session, "Format salah. Gunakan: /remove <nomor>", str(chat_id))
+                    if len(parts) < 2 or not (parts[1].isdigit() or parts[1].strip().startswith("0x")):
+                        await telegram_send_message(session, "Format salah. Gunakan: /remove <nomor> atau /remove <user_address>", str(chat_id))
                         continue
-                    index = int(parts[1])
-                    if await remove_user_address(index):
-                        await telegram_send_message(session, f"Berhasil menghapus alamat pada nomor {index}", str(chat_id))
+                    target = int(parts[1]) if parts[1].isdigit() else parts[1].strip()
+                    if await remove_user_address(target):
+                        await telegram_send_message(session, f"Berhasil menghapus {target}", str(chat_id))
                     else:
-                        await telegram_send_message(session, f"Gagal menghapus. Nomor {index} tidak valid.", str(chat_id))
+                        await telegram_send_message(session, f"Gagal menghapus. {target} tidak valid atau tidak ditemukan.", str(chat_id))
 
             return update_id + 1
 
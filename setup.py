@@ -45,6 +45,19 @@ def setup():
     config['telegram']['chatid'] = chatid
     config['telegram']['admins'] = ','.join(map(str, admins))
 
+    # Setup leaderboard discovery (opsional)
+    enable_discovery = input("\nAktifkan auto-discovery trader dari leaderboard? (y/N): ").strip().lower()
+    config['discovery'] = {'enabled': 'true' if enable_discovery == 'y' else 'false'}
+    if enable_discovery == 'y':
+        while True:
+            top_n = input("Jumlah trader teratas yang dipantau (default 10): ").strip() or "10"
+            if top_n.isdigit() and int(top_n) > 0:
+                break
+            print("Jumlah trader harus berupa angka lebih dari 0.")
+            logging.warning("Input top_n tidak valid.")
+        config['discovery']['top_n'] = top_n
+        config['discovery']['rankings'] = "month:pnl"
+
     try:
         with open('config.ini', 'w') as configfile:
             config.write(configfile)
@@ -61,17 +74,30 @@ def setup():
         if not address:
             break
         if address.startswith("0x") and len(address) == 42:
-            user_addresses.append(address)
+            if address.lower() not in user_addresses:
+                user_addresses.append(address.lower())
         else:
             print("Alamat harus diawali '0x' dan panjangnya 42 karakter.")
             logging.warning(f"Alamat tidak valid: {address}")
     
+    # Semua alamat dari setup adalah alamat manual: reset hasil discovery dan
+    # keluarkan alamat yang dimasukkan dari daftar ignored
+    try:
+        with open('ignored_addresses.json', 'r') as f:
+            ignored_addresses = {address.lower() for address in json.load(f)}
+    except (FileNotFoundError, json.JSONDecodeError):
+        ignored_addresses = set()
+
     try:
+        with open('discovered_addresses.json', 'w') as f:
+            json.dump([], f, indent=2)
+        with open('ignored_addresses.json', 'w') as f:
+            json.dump(sorted(ignored_addresses - set(user_addresses)), f, indent=2)
         with open('user_addresses.json', 'w') as f:
             json.dump(user_addresses, f, indent=2)
         logging.info(f"File user_addresses.json telah dibuat dengan {len(user_addresses)} alamat.")
     except IOError as e:
-        logging.error(f"Gagal menulis user_addresses.json: {e}")
+        logging.error(f"Gagal menulis file alamat pengguna: {e}")
         raise
 
     print("\nSetup selesai! File config.ini dan user_addresses.json telah dibuat.")
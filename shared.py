@@ -3,4 +3,10 @@ import threading
 
 # Variabel global untuk caching user_addresses
 TARGETED_USER_ADDRESSES = []
-user_addresses_lock = threading.Lock()
\ No newline at end of file
+# Alamat yang ditambahkan otomatis oleh leaderboard discovery
+DISCOVERED_USER_ADDRESSES = set()
+# Alamat yang dihapus manual dan tidak boleh ditambahkan lagi oleh discovery
+IGNORED_USER_ADDRESSES = set()
+user_addresses_lock = threading.Lock()
+# Statistik bergulir per alamat (AccountStats), diperbarui setiap siklus monitor
+ACCOUNT_STATS = {}